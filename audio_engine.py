@@ -0,0 +1,172 @@
+import threading
+
+import numpy as np
+
+from lip_sync_envelope import decode_audio
+
+PEAK_FLOOR = 0.05  # 归一化用的峰值下限，避免开头的底噪被放大成张嘴
+
+
+class PCMRingBuffer:
+    """PCM 环形缓冲区：读写只移动下标，不搬动已有数据；写入超出容量时按倍数扩容。"""
+    def __init__(self, capacity=1 << 20):
+        self._data = bytearray(capacity)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def write(self, data):
+        size = len(data)
+        if self._size + size > len(self._data):
+            self._grow(self._size + size)
+        capacity = len(self._data)
+        end = (self._start + self._size) % capacity
+        first = min(size, capacity - end)
+        self._data[end:end + first] = data[:first]
+        self._data[:size - first] = data[first:]
+        self._size += size
+
+    def read(self, size):
+        size = min(size, self._size)
+        capacity = len(self._data)
+        first = min(size, capacity - self._start)
+        data = bytes(self._data[self._start:self._start + first]) + bytes(self._data[:size - first])
+        self._start = (self._start + size) % capacity
+        self._size -= size
+        return data
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def _grow(self, needed):
+        data = self.read(self._size)
+        self._data = bytearray(max(len(self._data) * 2, needed))
+        self._data[:len(data)] = data
+        self._start = 0
+        self._size = len(data)
+
+
+class AudioEngine:
+    """
+    唯一的音频输出：流式合成的 PCM 块（feed）和整段音频文件（play_file）都写进同一个环形缓冲区，
+    由声卡回调以低延迟取出播放，缓冲区为空时输出静音，多句音频首尾相接没有间隙。
+    音频文件只解码一次，播放位置（position）与口型同步用的 RMS 都取自实际送出的这份数据。
+    rms 按当前这段音频到目前为止的峰值归一化，与预先算好的口型包络取值范围一致。
+    依赖 sounddevice，仅在 start 时导入。
+    """
+    def __init__(self, sample_rate=44100, channels=1, sample_width=2, blocksize=1024, latency='low'):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.blocksize = blocksize
+        self.latency = latency
+        self.rms = 0.0
+        self._peak = PEAK_FLOOR
+        self._buffer = PCMRingBuffer()
+        self._lock = threading.Lock()
+        self._stream = None
+        self._played_frames = 0  # 已送出的有效音频帧数（不含静音）
+        self._clip_start = 0     # 当前音频文件开始时的 _played_frames
+        self._clip_id = 0        # 每次 play_file / clear 加一，作废还没解码完的旧文件
+        self._decoding = 0
+
+    def start(self):
+        """打开音频输出；未安装 sounddevice 或没有可用声卡时抛出异常。"""
+        if self._stream is not None:
+            return
+        import sounddevice
+        self._stream = sounddevice.RawOutputStream(samplerate=self.sample_rate, channels=self.channels,
+                                                   dtype=f'int{self.sample_width * 8}', blocksize=self.blocksize,
+                                                   latency=self.latency, callback=self._callback)
+        self._stream.start()
+
+    def feed(self, data):
+        with self._lock:
+            self._buffer.write(data)
+
+    def play_file(self, path):
+        """打断当前音频，在后台线程解码 path 后开始播放；解码期间 playing 仍为 True，播放队列不会提前取下一句。"""
+        self.start()
+        with self._lock:
+            self._clip_id += 1
+            clip_id = self._clip_id
+            self._buffer.clear()
+            self._clip_start = self._played_frames
+            self._peak = PEAK_FLOOR
+            self._decoding += 1
+        threading.Thread(target=self._decode_and_play, args=(path, clip_id), daemon=True,
+                         name='audio-decode').start()
+
+    def clear(self):
+        """丢弃尚未播放的音频。"""
+        with self._lock:
+            self._clip_id += 1
+            self._buffer.clear()
+            self._peak = PEAK_FLOOR
+        self.rms = 0.0
+
+    @property
+    def playing(self):
+        return self._decoding > 0 or len(self._buffer) >= self.sample_width * self.channels
+
+    @property
+    def position(self):
+        """当前音频文件已经从扬声器播出的秒数，扣除了输出延迟。"""
+        latency = self._stream.latency if self._stream is not None else 0.0
+        return max(0.0, (self._played_frames - self._clip_start) / self.sample_rate - latency)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _decode_and_play(self, path, clip_id):
+        try:
+            samples, sample_rate = decode_audio(path)
+            if sample_rate != self.sample_rate:  # 线性插值重采样到输出采样率
+                frames = int(len(samples) * self.sample_rate / sample_rate)
+                samples = np.interp(np.arange(frames) * (sample_rate / self.sample_rate),
+                                    np.arange(len(samples)), samples)
+            pcm = np.repeat((np.clip(samples, -1, 1) * 32767).astype('<i2')[:, None], self.channels, axis=1)
+            with self._lock:
+                if clip_id == self._clip_id:
+                    self._buffer.write(pcm.tobytes())
+                    self._clip_start = self._played_frames
+        except Exception as e:
+            print(f'生成的音频文件无法正常读取,请检查{e}')
+        finally:
+            with self._lock:
+                self._decoding -= 1
+
+    def _callback(self, outdata, frames, time_info, status):
+        frame_bytes = self.sample_width * self.channels
+        wanted = frames * frame_bytes
+        with self._lock:
+            data = self._buffer.read(min(wanted, len(self._buffer) // frame_bytes * frame_bytes))
+            self._played_frames += len(data) // frame_bytes
+        size = len(data)
+        outdata[:size] = data
+        outdata[size:] = b'\x00' * (wanted - size)
+        if not size:
+            self.rms = 0.0
+            return
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768
+        self._peak = max(self._peak, float(np.abs(samples).max()))
+        self.rms = float(np.sqrt(np.mean(np.square(samples)))) / self._peak
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_audio_engine(sample_rate=44100):
+    """进程内共用的音频输出，流式合成与整段播放都经过它；首次调用时的参数生效。"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioEngine(sample_rate=sample_rate)
+        return _engine
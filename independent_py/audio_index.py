@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import wave
+
+from lip_sync_envelope import envelope_path
+
+MP3_BITRATE = 128000  # Fish Audio 默认的 mp3 码率，用于估算时长
+AUDIO_SUFFIXES = ('.mp3', '.wav')
+
+
+def audio_duration(path):
+    """wav 读文件头得到精确时长，mp3 按码率估算；文件损坏时返回 0。"""
+    if path.endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as wav_file:
+                return wav_file.getnframes() / wav_file.getframerate()
+        except (wave.Error, EOFError):
+            return 0.0
+    return os.path.getsize(path) * 8 / MP3_BITRATE
+
+
+class AudioIndex:
+    """
+    tmp_audio 目录的持久化索引（index.json），按生成顺序记录每段音频的
+    文件名、文本哈希、时长、大小与生成时间。取最新音频只看最后一条，不必再扫描整个目录；
+    超出保留大小或保留天数的旧音频在后台删除，最新的一段始终保留。可在多个线程中共用。
+    """
+    def __init__(self, folder, max_bytes=256 * 1024 * 1024, max_age=7 * 24 * 3600):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.index_path = os.path.join(folder, 'index.json')
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._clips = json.load(f)["clips"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self._clips = self._scan()
+            self._save()
+
+    def add(self, path, text=''):
+        clip = {
+            "name": os.path.basename(path),
+            "text_hash": hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            "duration": round(audio_duration(path), 3),
+            "size": os.path.getsize(path),
+            "created": time.time(),
+        }
+        with self._lock:
+            self._clips.append(clip)
+            self._save()
+        self.evict()
+
+    def latest(self):
+        """返回最新一段仍然存在的音频路径，没有时返回 None。"""
+        with self._lock:
+            while self._clips:
+                path = os.path.join(self.folder, self._clips[-1]["name"])
+                if os.path.exists(path):
+                    return path
+                self._clips.pop()
+            return None
+
+    def evict(self):
+        with self._lock:
+            expire_before = time.time() - self.max_age
+            total_bytes = sum(clip["size"] for clip in self._clips)
+            removed = 0
+            while len(self._clips) - removed > 1:
+                clip = self._clips[removed]
+                if total_bytes <= self.max_bytes and clip["created"] >= expire_before:
+                    break
+                clip_path = os.path.join(self.folder, clip["name"])
+                # 连同旁边预先算好的口型包络一起删除
+                for path in (clip_path, envelope_path(clip_path)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                total_bytes -= clip["size"]
+                removed += 1
+            if removed:
+                del self._clips[:removed]
+                self._save()
+
+    def evict_async(self):
+        threading.Thread(target=self.evict, daemon=True).start()
+
+    def _scan(self):
+        # 没有索引时（旧版本生成的目录）按修改时间扫描一次建立索引
+        clips = list()
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.endswith(AUDIO_SUFFIXES):
+                stat = entry.stat()
+                clips.append({"name": entry.name, "text_hash": None,
+                              "duration": round(audio_duration(entry.path), 3),
+                              "size": stat.st_size, "created": stat.st_mtime})
+        clips.sort(key=lambda clip: clip["created"])
+        return clips
+
+    def _save(self):
+        tmp_path = os.path.join(self.folder, f'{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"clips": self._clips}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,102 @@
+import math
+import re
+
+# 中日韩文字大致一字一个 token，其余字符按每 4 个字符一个 token 估算
+CJK_PATTERN = re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯＀-￯]')
+MESSAGE_OVERHEAD_TOKENS = 4  # 每条消息的角色、分隔符等固定开销
+
+_tiktoken_encoding = None
+
+
+def estimate_tokens(text):
+    """
+    估算一段文本的 token 数。安装了 tiktoken 时使用 cl100k_base 编码计数，
+    否则按字符类型粗略估算，对不同供应商的分词器都只是近似值。
+    """
+    global _tiktoken_encoding
+    if _tiktoken_encoding is None:
+        try:
+            import tiktoken
+            _tiktoken_encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _tiktoken_encoding = False
+    if _tiktoken_encoding:
+        return len(_tiktoken_encoding.encode(text))
+    cjk_count = len(CJK_PATTERN.findall(text))
+    return cjk_count + math.ceil((len(text) - cjk_count) / 4)
+
+
+class ContextBudget:
+    """
+    按 token 预算组装发送给大模型的上下文：
+    固定保留开头的系统提示词与开场白，再从最新的消息往前装，直到预算用完；
+    最近的若干条消息无论预算如何都会保留。每条消息的 token 数只计算一次。
+
+    cache_friendly 模式下窗口起点不再每轮滑动：只要放得下就保持不变，
+    超出预算时一次裁到 compact_ratio 的预算，之后若干轮请求的前缀逐字节一致，
+    供应商的前缀缓存才能命中。
+    """
+    def __init__(self, default_budget=16000, reserve_tokens=1024, pinned_messages=2,
+                 keep_recent_messages=4, max_cache_size=4096, cache_friendly=False, compact_ratio=0.6):
+        self.default_budget = default_budget
+        self.reserve_tokens = reserve_tokens              # 留给模型回复的 token
+        self.pinned_messages = pinned_messages            # 开头固定保留的消息数（系统提示词、开场白）
+        self.keep_recent_messages = keep_recent_messages
+        self.max_cache_size = max_cache_size
+        self._token_cache = dict()
+        self.cache_friendly = cache_friendly
+        self.compact_ratio = compact_ratio
+        self._anchor = None  # cache_friendly 模式下固定的窗口起点
+
+    def reset_anchor(self):
+        self._anchor = None
+
+    def count(self, message):
+        key = (message['role'], message['content'])
+        tokens = self._token_cache.get(key)
+        if tokens is None:
+            if len(self._token_cache) >= self.max_cache_size:
+                self._token_cache.clear()
+            tokens = estimate_tokens(message['content']) + MESSAGE_OVERHEAD_TOKENS
+            self._token_cache[key] = tokens
+        return tokens
+
+    def pinned_count(self, conversation_history):
+        return min(self.pinned_messages, len(conversation_history))
+
+    def window_start(self, conversation_history, budget=None, extra_tokens=0):
+        """返回预算内最早保留的消息下标（固定保留的开头消息除外），extra_tokens 为额外插入内容的开销。"""
+        budget = budget or self.default_budget
+        pinned = self.pinned_count(conversation_history)
+        available = budget - self.reserve_tokens - extra_tokens \
+            - sum(self.count(message) for message in conversation_history[:pinned])
+        if self.cache_friendly and self._anchor is not None and pinned <= self._anchor <= len(conversation_history):
+            if sum(self.count(message) for message in conversation_history[self._anchor:]) <= available:
+                return self._anchor
+            available = int(available * self.compact_ratio)  # 一次多裁掉一截，换取之后若干轮前缀不变
+        start = len(conversation_history)
+        used = 0
+        for index in range(len(conversation_history) - 1, pinned - 1, -1):
+            used += self.count(conversation_history[index])
+            if used > available and len(conversation_history) - index > self.keep_recent_messages:
+                break
+            start = index
+        # 窗口尽量从用户消息开始，避免以孤立的 assistant 回复开头
+        while start < len(conversation_history) - self.keep_recent_messages \
+                and conversation_history[start]['role'] == 'assistant':
+            start += 1
+        if self.cache_friendly:
+            self._anchor = start
+        return start
+
+    def assemble(self, conversation_history, budget=None, summary_message=None):
+        """
+        组装上下文；有早期对话的摘要时插在开头固定消息之后。被摘要覆盖的消息可能已经挤出窗口，
+        也可能已经从历史中截断（此时窗口从固定消息之后开始），两种情况都要带上摘要。
+        """
+        pinned = self.pinned_count(conversation_history)
+        summary_tokens = self.count(summary_message) if summary_message else 0
+        start = self.window_start(conversation_history, budget, summary_tokens)
+        if summary_message:
+            return conversation_history[:pinned] + [summary_message] + conversation_history[start:]
+        return conversation_history[:pinned] + conversation_history[start:]
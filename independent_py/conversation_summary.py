@@ -0,0 +1,64 @@
+import hashlib
+
+
+def message_fingerprint(message):
+    return hashlib.sha1(f"{message['role']}\n{message['content']}".encode('utf-8')).hexdigest()
+
+
+class RollingSummary:
+    """
+    滚动摘要：把挤出上下文窗口的早期对话压缩成一条记忆消息。
+    covered_until 为已被摘要覆盖的消息下标（不含），fingerprint 为最后一条被覆盖消息的指纹，
+    对话历史被改动导致对不上时摘要作废重来。
+    """
+    def __init__(self, content='', covered_until=0, fingerprint=''):
+        self.content = content
+        self.covered_until = covered_until
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_json(cls, data, pinned):
+        if not data:
+            return cls(covered_until=pinned)
+        return cls(data.get('content', ''), data.get('covered_until', pinned), data.get('fingerprint', ''))
+
+    def to_json(self):
+        return {"content": self.content, "covered_until": self.covered_until, "fingerprint": self.fingerprint}
+
+    def validate(self, conversation_history, pinned):
+        if not self.content:
+            self.covered_until = max(self.covered_until, pinned)
+            return
+        if self.covered_until > len(conversation_history) or self.covered_until <= 0 \
+                or message_fingerprint(conversation_history[self.covered_until - 1]) != self.fingerprint:
+            print('对话历史已被修改，早期摘要作废')
+            self.rebase(conversation_history, pinned, keep_content=False)
+
+    def rebase(self, conversation_history, pinned, keep_content=True):
+        """历史被截断后，让摘要从固定消息之后重新接续。"""
+        if not keep_content:
+            self.content = ''
+        self.covered_until = pinned
+        self.fingerprint = message_fingerprint(conversation_history[pinned - 1]) if pinned else ''
+
+    def pending_messages(self, conversation_history, window_start, max_messages=20):
+        """返回已挤出窗口但尚未摘要的消息，以及摘要完成后的 (covered_until, fingerprint)。"""
+        end = min(window_start, self.covered_until + max_messages)
+        if end <= self.covered_until:
+            return list(), None
+        return conversation_history[self.covered_until:end], (end, message_fingerprint(conversation_history[end - 1]))
+
+    def build_request(self, prompt, messages):
+        transcript = '\n'.join(f"{message['role']}: {message['content']}" for message in messages)
+        previous = self.content or '（暂无）'
+        return [prompt, {"role": "user", "content": f"已有摘要：\n{previous}\n\n新增对话：\n{transcript}"}]
+
+    def apply(self, content, target):
+        if content.strip():
+            self.content = content.strip()
+            self.covered_until, self.fingerprint = target
+
+    def as_message(self):
+        if not self.content:
+            return None
+        return {"role": "system", "content": f"以下是更早对话的摘要：\n{self.content}"}
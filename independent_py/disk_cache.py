@@ -0,0 +1,104 @@
+import collections
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+
+class DiskLRUCache:
+    """
+    内容寻址的磁盘缓存：文件名为键的 sha256，总大小超出上限时淘汰最久未使用的条目。
+    最近使用时间以文件 mtime 持久化，重启后照样按 LRU 顺序淘汰。可在多个线程中共用。
+    """
+    def __init__(self, cache_dir, max_bytes=32 * 1024 * 1024, suffix='.bin'):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()  # key -> 字节数，越靠后越新
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        files = [entry for entry in os.scandir(cache_dir)
+                 if entry.is_file() and entry.name.endswith(suffix)]
+        for entry in sorted(files, key=lambda f: f.stat().st_mtime):
+            size = entry.stat().st_size
+            self._entries[entry.name[:-len(suffix)]] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(*parts):
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f'{key}{self.suffix}')
+
+    def get_path(self, key):
+        """命中时返回缓存文件路径并刷新其使用时间，未命中返回 None。"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def get(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, data):
+        tmp_path = self._tmp_path()
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        self._commit(key, tmp_path, len(data))
+
+    def put_file(self, key, src_path):
+        tmp_path = self._tmp_path()
+        shutil.copyfile(src_path, tmp_path)
+        self._commit(key, tmp_path, os.path.getsize(tmp_path))
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _tmp_path(self):
+        return os.path.join(self.cache_dir, f'{uuid.uuid4().hex}.tmp')
+
+    def _commit(self, key, tmp_path, size):
+        # 先写临时文件再原子替换，读者不会看到写了一半的条目
+        with self._lock:
+            os.replace(tmp_path, self.path_for(key))
+            self._forget(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest_key = next(iter(self._entries))
+                self._forget(oldest_key)
+                try:
+                    os.remove(self.path_for(oldest_key))
+                except FileNotFoundError:
+                    pass
+
+    def _forget(self, key):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
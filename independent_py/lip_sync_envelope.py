@@ -0,0 +1,87 @@
+import os
+import wave
+
+import numpy as np
+
+ENVELOPE_RATE = 60  # 每秒的口型帧数，与渲染帧率一致
+ENVELOPE_SUFFIX = '.npy'
+
+
+def envelope_path(audio_path):
+    """口型包络与音频同名，放在同一目录下。"""
+    return os.path.splitext(audio_path)[0] + ENVELOPE_SUFFIX
+
+
+def decode_audio(path):
+    """
+    解码为 [-1, 1] 范围的单声道 float32 采样，返回 (samples, sample_rate)。
+    wav（包括流式合成保存的 PCM）按文件头识别，直接用 wave 读取；其它格式交给 pydub（需要 ffmpeg）。
+    """
+    with open(path, 'rb') as f:
+        is_wav = f.read(4) == b'RIFF'
+    if is_wav:
+        with wave.open(path, 'rb') as wav_file:
+            sample_rate = wav_file.getframerate()
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            raw = wav_file.readframes(wav_file.getnframes())
+    else:
+        from pydub import AudioSegment
+        audio = AudioSegment.from_file(path)
+        sample_rate, channels, sample_width, raw = audio.frame_rate, audio.channels, audio.sample_width, audio.raw_data
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    else:
+        samples = np.frombuffer(raw, dtype=f'<i{sample_width}').astype(np.float32) / 2 ** (sample_width * 8 - 1)
+    return samples.reshape(-1, channels).mean(axis=1), sample_rate
+
+
+def compute_envelope(samples, sample_rate, rate=ENVELOPE_RATE):
+    """按峰值归一化后每 1/rate 秒取一次 RMS，与 WavHandler.GetRms 的取值范围一致。"""
+    if not samples.size:
+        return np.zeros(0, dtype=np.float32)
+    peak = np.abs(samples).max()
+    if peak:
+        samples = samples / peak
+    hop = max(1, round(sample_rate / rate))
+    frames = -(-samples.size // hop)
+    padded = np.zeros(frames * hop, dtype=np.float32)
+    padded[:samples.size] = samples
+    return np.sqrt(np.mean(np.square(padded.reshape(frames, hop)), axis=1)).astype(np.float32)
+
+
+def write_envelope(audio_path):
+    """合成完成后调用一次，把口型包络保存到音频旁边；解码失败时不写入，播放端回退到实时计算。"""
+    try:
+        envelope = compute_envelope(*decode_audio(audio_path))
+    except Exception as e:
+        print(f'口型包络计算失败:{e}')
+        return None
+    np.save(envelope_path(audio_path), envelope)
+    return envelope
+
+
+class LipSyncEnvelope:
+    """预先算好的口型包络，渲染循环按播放时间直接取值。"""
+    def __init__(self, values, rate=ENVELOPE_RATE):
+        self.values = values
+        self.rate = rate
+
+    @classmethod
+    def load(cls, audio_path):
+        """读取音频旁边的包络文件，没有时返回 None。"""
+        try:
+            return cls(np.load(envelope_path(audio_path)))
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+
+    @property
+    def duration(self):
+        return len(self.values) / self.rate
+
+    def value_at(self, position):
+        """position 秒处的口型开合度，超出音频长度时返回 None。"""
+        index = int(position * self.rate)
+        if index < 0 or index >= len(self.values):
+            return None
+        return float(self.values[index])
@@ -0,0 +1,68 @@
+from check_and_add_br import END_PUNCTUATIONS
+
+# 全角结束标点后无需空格即可断句；半角 . ! ? 后必须跟空白，避免把 3.14 之类切开
+FULL_WIDTH_END_PUNCTUATIONS = {'。', '！', '？'}
+# 紧跟在结束标点后、仍属于本句的收尾引号
+CLOSING_QUOTES = {'"', "'", '”', '’', '」', '』'}
+# 括号内与 *星号* 之间通常是动作描写，不在其中断句
+BRACKET_PAIRS = {'(': ')', '（': '）', '[': ']', '【': '】', '《': '》'}
+
+
+class SentenceSplitter:
+    """
+    增量断句器：流式输入 token，返回已经完整的句子。
+    断句点为 END_PUNCTUATIONS 中的结束标点（含其后的收尾引号）或换行，
+    括号与星号包裹的动作描写不会被拆开。
+    """
+    def __init__(self):
+        self._buffer = list()
+        self._closers = list()
+        self._in_asterisk = False
+        self._pending_end = None  # 已遇到结束标点，等待下一个字符确认断句
+
+    def feed(self, text):
+        """
+        Returns:
+            [(sentence, cut), ...]，cut 为句子在本次输入 text 中的结束下标，
+            句子恰好在上一次输入的末尾结束时 cut 为 0。
+        """
+        sentences = list()
+        for index, char in enumerate(text):
+            if self._pending_end is not None:
+                if char in END_PUNCTUATIONS or char in CLOSING_QUOTES:
+                    self._buffer.append(char)
+                    continue
+                if self._pending_end in FULL_WIDTH_END_PUNCTUATIONS or char.isspace():
+                    self._emit(sentences, index)
+                self._pending_end = None
+            self._buffer.append(char)
+            if self._in_asterisk:
+                self._in_asterisk = char != '*'
+            elif char == '*':
+                self._in_asterisk = True
+            elif char in BRACKET_PAIRS:
+                self._closers.append(BRACKET_PAIRS[char])
+            elif self._closers:
+                if char == self._closers[-1]:
+                    self._closers.pop()
+            elif char == '\n':
+                self._buffer.pop()
+                self._emit(sentences, index)
+            elif char in END_PUNCTUATIONS:
+                self._pending_end = char
+        return sentences
+
+    def flush(self):
+        """流结束时取出剩余内容作为最后一句。"""
+        sentences = list()
+        self._emit(sentences, 0)
+        self._closers.clear()
+        self._in_asterisk = False
+        self._pending_end = None
+        return [sentence for sentence, _ in sentences]
+
+    def _emit(self, sentences, cut):
+        sentence = ''.join(self._buffer).strip()
+        self._buffer.clear()
+        if sentence:
+            sentences.append((sentence, cut))
@@ -0,0 +1,74 @@
+import json
+import timeit
+
+
+def parse_stream_chunk(chunk):
+    """
+    直接读取流式 chunk 的 delta 属性，不再 model_dump_json -> json.loads 往返序列化。
+
+    Args:
+        chunk: openai SDK 返回的 ChatCompletionChunk。
+
+    Returns:
+        (content, reasoning_content, usage) 三元组，缺失的字段为 None。
+        最后一个只携带 usage 的 chunk 的 choices 为空，此时只返回 usage。
+    """
+    content = None
+    reasoning_content = None
+    choices = chunk.choices
+    if choices:
+        delta = choices[0].delta
+        if delta is not None:
+            content = delta.content
+            # deepseek-reasoner 等供应商的扩展字段，pydantic 以 extra 属性保存
+            reasoning_content = getattr(delta, 'reasoning_content', None)
+    return content, reasoning_content, chunk.usage
+
+
+def parse_cache_usage(usage):
+    """
+    从 usage 中取出提示词 token 数与命中前缀缓存的 token 数。
+    DeepSeek 使用 prompt_cache_hit_tokens，OpenAI 及兼容接口使用 prompt_tokens_details.cached_tokens。
+
+    Returns:
+        (prompt_tokens, cached_tokens)，供应商未返回缓存信息时 cached_tokens 为 None。
+    """
+    if usage is None:
+        return 0, None
+    prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+    cached_tokens = getattr(usage, 'prompt_cache_hit_tokens', None)
+    if cached_tokens is None:
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) if details is not None else None
+    return prompt_tokens, cached_tokens
+
+
+def parse_stream_chunk_by_json(chunk):
+    """旧路径：整块重新编码为 JSON 再解析，仅保留用于基准对比。"""
+    json_content = json.loads(chunk.model_dump_json())
+    choices = json_content['choices']
+    delta = choices[0]['delta'] if choices else {}
+    return delta.get('content'), delta.get('reasoning_content'), json_content.get('usage')
+
+
+if __name__ == "__main__":
+    # 微基准：对比属性直读与 JSON 往返两条路径处理一次典型回复的耗时
+    from openai.types.chat import ChatCompletionChunk
+
+    def make_chunk(content, usage=None):
+        return ChatCompletionChunk.model_validate({
+            "id": "bench", "object": "chat.completion.chunk", "created": 0, "model": "deepseek-chat",
+            "choices": [] if content is None else [{"index": 0, "delta": {"content": content,
+                                                                          "reasoning_content": None},
+                                                    "finish_reason": None}],
+            "usage": usage,
+        })
+
+    chunks = [make_chunk(f'token{i} ') for i in range(500)]
+    chunks.append(make_chunk(None, {"prompt_tokens": 100, "completion_tokens": 500, "total_tokens": 600}))
+
+    rounds = 20
+    for name, parser in (('属性直读', parse_stream_chunk), ('JSON 往返', parse_stream_chunk_by_json)):
+        cost = timeit.timeit(lambda: [parser(c) for c in chunks], number=rounds) / rounds
+        print(f'{name}: 每条回复({len(chunks)} chunk) {cost * 1000:.3f} ms，'
+              f'每 chunk {cost / len(chunks) * 1e6:.2f} µs')
@@ -0,0 +1,60 @@
+import asyncio
+import importlib.util
+
+import httpx
+
+from openai_format import chat_with_openai_like_llm
+
+
+class LLMClientPool:
+    """
+    为 llm_api_key.yaml 中的每个条目保留一个长期存活的客户端。
+    所有客户端共享同一个 httpx 连接池，切换模型时直接复用已建立的 TCP+TLS 连接。
+    连接池只在流式引擎的事件循环中使用。
+    """
+    def __init__(self, llm_api_data, http2=False, max_connections=20,
+                 max_keepalive_connections=10, keepalive_expiry=120.0):
+        self.llm_api_data = llm_api_data
+        # 未安装 h2 时 httpx 开启 http2 会直接报错，这里退回 HTTP/1.1
+        self.http2 = http2 and importlib.util.find_spec('h2') is not None
+        self.http_client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        self._clients = dict()
+
+    def get_client(self, provider_name):
+        client = self._clients.get(provider_name)
+        if client is None:
+            llm_model_parameter = self.llm_api_data[provider_name]
+            if int(llm_model_parameter['mode']) == 0:
+                client = chat_with_openai_like_llm(llm_model_parameter['api_key'],
+                                                   llm_model_parameter['base_url'],
+                                                   http_client=self.http_client)
+            self._clients[provider_name] = client
+        return client
+
+    def get_model_name(self, provider_name):
+        return self.llm_api_data[provider_name]['model_name']
+
+    async def prewarm(self):
+        base_urls = list()
+        for provider_name in self.llm_api_data:
+            self.get_client(provider_name)
+            base_url = self.llm_api_data[provider_name]['base_url']
+            if base_url not in base_urls:
+                base_urls.append(base_url)
+        await asyncio.gather(*(self._prewarm_one(base_url) for base_url in base_urls))
+
+    async def _prewarm_one(self, base_url):
+        # 返回什么状态码都无所谓，只为提前完成握手并把连接留在池中
+        try:
+            await self.http_client.get(base_url, timeout=5.0)
+        except Exception as e:
+            print(f'{base_url} 预热连接失败: {e}')
+
+    async def close(self):
+        await self.http_client.aclose()
@@ -1,6 +1,6 @@
-from openai import OpenAI
-
-def chat_with_openai_like_llm(api_key, base_url):
-    client = OpenAI(api_key=api_key, base_url=base_url)
-    return client
-
+from openai import AsyncOpenAI
+
+def chat_with_openai_like_llm(api_key, base_url, http_client=None):
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+    return client
+
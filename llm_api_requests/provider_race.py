@@ -0,0 +1,141 @@
+import asyncio
+import collections
+import time
+
+from chunk_parser import parse_stream_chunk
+
+
+class TimedStream:
+    """
+    包装一次流式响应：记录首 token 延迟，并支持预读到首 token 为止，
+    预读到的 chunk 之后照常按顺序产出。
+    """
+    def __init__(self, stream_response, provider_name, started_at, on_first_token=None):
+        self.stream_response = stream_response
+        self.provider_name = provider_name
+        self.started_at = started_at
+        self.on_first_token = on_first_token
+        self.first_token_seen = False
+        self._iterator = stream_response.__aiter__()
+        self._pending = collections.deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pending:
+            return self._pending.popleft()
+        return await self._read()
+
+    async def _read(self):
+        chunk = await anext(self._iterator)
+        if not self.first_token_seen:
+            content, reasoning_content, _ = parse_stream_chunk(chunk)
+            if content or reasoning_content:
+                self.first_token_seen = True
+                if self.on_first_token is not None:
+                    self.on_first_token(self.provider_name, time.perf_counter() - self.started_at)
+        return chunk
+
+    async def wait_first_token(self):
+        while not self.first_token_seen:
+            self._pending.append(await self._read())
+
+    async def close(self):
+        await self.stream_response.close()
+
+
+class ProviderLatencyStats:
+    """
+    按供应商统计首 token 延迟（指数滑动平均），并记录每组赛跑的胜负。
+    某一方明显更快时直接只用它，每隔若干次再赛跑一次刷新判断：两方都有足够的首 token 样本时
+    比较平均延迟，否则（落败方被取消，拿不到样本）看最近赛跑的胜率。
+    """
+    def __init__(self, skip_win_rate=0.8, min_races=3, window=10, reprobe_every=10, alpha=0.3,
+                 skip_ttft_ratio=0.7):
+        self.skip_win_rate = skip_win_rate
+        self.skip_ttft_ratio = skip_ttft_ratio
+        self.min_races = min_races
+        self.window = window
+        self.reprobe_every = reprobe_every
+        self.alpha = alpha
+        self.ttft_mean = dict()
+        self.ttft_count = collections.Counter()
+        self._race_winners = dict()   # frozenset(供应商对) -> 最近的胜者
+        self._skipped = collections.Counter()
+
+    def record_ttft(self, provider_name, ttft):
+        previous = self.ttft_mean.get(provider_name)
+        self.ttft_mean[provider_name] = ttft if previous is None \
+            else previous + self.alpha * (ttft - previous)
+        self.ttft_count[provider_name] += 1
+
+    def record_race(self, provider_names, winner):
+        pair = frozenset(provider_names)
+        self._race_winners.setdefault(pair, collections.deque(maxlen=self.window)).append(winner)
+
+    def clear_leader(self, primary, challenger):
+        """明显更快的一方，分不出时返回 None。"""
+        if min(self.ttft_count[primary], self.ttft_count[challenger]) >= self.min_races:
+            fast, slow = sorted((primary, challenger), key=self.ttft_mean.get)
+            return fast if self.ttft_mean[fast] <= self.skip_ttft_ratio * self.ttft_mean[slow] else None
+        winners = self._race_winners.get(frozenset((primary, challenger)))
+        if winners and len(winners) >= self.min_races:
+            leader, wins = collections.Counter(winners).most_common(1)[0]
+            if wins / len(winners) >= self.skip_win_rate:
+                return leader
+        return None
+
+    def race_candidates(self, primary, challenger):
+        leader = self.clear_leader(primary, challenger)
+        if leader is not None:
+            pair = frozenset((primary, challenger))
+            self._skipped[pair] += 1
+            if self._skipped[pair] % self.reprobe_every:
+                return [leader]
+        return [primary, challenger]
+
+
+async def race_first_token(open_stream, provider_names, stats):
+    """
+    向多个供应商同时发出同一请求，谁先产出首个 token 就用谁，其余立即取消并关闭连接。
+
+    Args:
+        open_stream: 协程函数，参数为供应商名，返回 TimedStream。
+        provider_names: 参赛的供应商列表。
+        stats: ProviderLatencyStats，记录本次胜者。
+
+    Returns:
+        胜出的 TimedStream，其首 token 已预读，迭代时照常产出。
+    """
+    async def contender(provider_name):
+        stream = await open_stream(provider_name)
+        try:
+            await stream.wait_first_token()
+        except BaseException:
+            await stream.close()
+            raise
+        return stream
+
+    tasks = [asyncio.ensure_future(contender(provider_name)) for provider_name in provider_names]
+    winner = None
+    try:
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if winner is None and not task.cancelled() and task.exception() is None:
+                    winner = task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if winner is None:
+        raise tasks[0].exception()
+    # 同时到达首 token 的落选者也要关闭
+    for task in tasks:
+        if not task.cancelled() and task.exception() is None and task.result() is not winner:
+            await task.result().close()
+    stats.record_race(provider_names, winner.provider_name)
+    print(f'赛跑胜出: {winner.provider_name}')
+    return winner
@@ -1,68 +1,284 @@
-from PyQt5.QtCore import pyqtSignal, QObject
-from openai_format import chat_with_openai_like_llm
-import json
-
-
-
-class ChatWithLLM:
-    def __init__(self, specification=0, init_api=str(), init_url=str(), init_model_name=str()):
-        self.client = self.create_llm_service(specification, init_api, init_url)
-        self.model_name = init_model_name
-    def rebuild_llm_client(self, specification, api_key, base_url, model_name):
-        self.client = self.create_llm_service(specification, api_key, base_url)
-        self.model_name = model_name
-
-    @staticmethod
-    def create_llm_service(mode=0, api_key='', base_url=''):
-        if mode == 0:
-            llm_model = chat_with_openai_like_llm(api_key, base_url)
-        return llm_model
-
-    def get_llm_response(self, conversation_history):
-        try:
-            stream_response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=conversation_history,
-                stream=True
-            )
-            return stream_response
-        except Exception as e:
-            print(e, '网络请求失败')
-            return None
-
-# 大模型工作线程
-class LLMWorker(QObject):
-    new_token_received = pyqtSignal(str) # 每次接收一个字符（或HTML片段）就发送
-    response_finished = pyqtSignal(str, int)     # 响应完成时发送
-    error_occurred = pyqtSignal(str)     # 发生错误时发送
-
-    def __init__(self, stream_response_obeject, parent=None):
-        super().__init__(parent)
-        self.total_tokens = 0
-        self.full_response = str()
-        self.stream_response_obeject = stream_response_obeject
-        self._running = True
-
-    def run(self):
-        json_content = None
-        if self.stream_response_obeject is None:
-            return
-        for chunk in self.stream_response_obeject:
-            if not self._running:
-                break
-            try:
-                    json_content = json.loads(chunk.model_dump_json())
-                    content = json_content['choices'][0]['delta']['content']
-                    # print(content, end="", flush=True)
-                    self.new_token_received.emit(content)
-                    self.full_response += content
-            except Exception as e:
-                ...
-        if json_content:
-            tokens = json_content['usage']['total_tokens']
-            self.total_tokens += tokens
-            print(self.total_tokens)
-        self.response_finished.emit(self.full_response, self.total_tokens)
-
-    def stop(self):
-        self._running = False
\ No newline at end of file
+from PyQt5.QtCore import pyqtSignal, QObject
+from chunk_parser import parse_stream_chunk, parse_cache_usage
+from provider_race import ProviderLatencyStats, TimedStream, race_first_token
+import openai
+import asyncio
+import collections
+import itertools
+import threading
+import time
+
+
+
+class ChatWithLLM:
+    def __init__(self, client_pool, provider_name, race_provider=None, latency_stats=None):
+        self.client_pool = client_pool
+        # 选填：与当前供应商赛跑首 token 的另一个供应商，为空则不赛跑
+        self.race_provider = race_provider
+        self.latency_stats = latency_stats or ProviderLatencyStats()
+        self.switch_llm_client(provider_name)
+
+    def switch_llm_client(self, provider_name):
+        # 客户端由连接池长期持有，切换模型不再重新建立 TCP+TLS 连接
+        self.provider_name = provider_name
+        self.model_name = self.client_pool.get_model_name(provider_name)
+
+    async def get_llm_response(self, conversation_history, provider_name=None, allow_race=False):
+        provider_name = provider_name or self.provider_name
+        if allow_race and self.race_provider and self.race_provider != provider_name:
+            candidates = self.latency_stats.race_candidates(provider_name, self.race_provider)
+            if len(candidates) > 1:
+                return await race_first_token(
+                    lambda name: self._open_stream(conversation_history, name, record_ttft=True),
+                    candidates, self.latency_stats)
+            provider_name = candidates[0]  # 一方明显更快，本次不再赛跑
+        return await self._open_stream(conversation_history, provider_name, record_ttft=allow_race)
+
+    async def _open_stream(self, conversation_history, provider_name, record_ttft=False):
+        """
+        record_ttft 只对参与赛跑判断的主回复打开：摘要、翻译等提示词短、首 token 快，
+        混进统计会让平均延迟失真，进而影响是否跳过赛跑的判断。
+        """
+        client = self.client_pool.get_client(provider_name)
+        started_at = time.perf_counter()
+        stream_response = await client.chat.completions.create(
+            model=self.client_pool.get_model_name(provider_name),
+            messages=conversation_history,
+            stream=True,
+            stream_options={"include_usage": True}  # 最后一个 chunk 附带 usage，含前缀缓存命中信息
+        )
+        return TimedStream(stream_response, provider_name, started_at,
+                           self.latency_stats.record_ttft if record_ttft else None)
+
+class TokenBatcher:
+    """
+    攒积 token，按显示帧间隔或字数阈值合并成一次信号发送，
+    避免高速供应商每秒几百次的跨线程信号挤占 UI 事件循环。
+    传入事件循环时，残留在缓冲区的尾巴会在间隔到期后由定时器补发。
+    """
+    def __init__(self, emit_func, flush_interval_ms=16, max_chars=256, loop=None):
+        self.emit_func = emit_func
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_chars = max_chars
+        self.loop = loop
+        self._buffer = list()
+        self._buffer_chars = 0
+        self._last_flush = time.perf_counter()
+        self._flush_handle = None
+        self.received_count = 0  # 收到的 token 片段数
+        self.emitted_count = 0   # 实际发出的信号数
+
+    def push(self, token):
+        if not token:
+            return
+        self._buffer.append(token)
+        self._buffer_chars += len(token)
+        self.received_count += 1
+        elapsed = time.perf_counter() - self._last_flush
+        if self._buffer_chars >= self.max_chars or elapsed >= self.flush_interval:
+            self.flush()
+        elif self.loop is not None and self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.flush_interval - elapsed, self.flush)
+
+    def flush(self):
+        self._cancel_timer()
+        if not self._buffer:
+            return
+        self.emit_func(''.join(self._buffer))
+        self._buffer.clear()
+        self._buffer_chars = 0
+        self._last_flush = time.perf_counter()
+        self.emitted_count += 1
+
+    def discard(self):
+        self._cancel_timer()
+        self._buffer.clear()
+        self._buffer_chars = 0
+
+    def _cancel_timer(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    @property
+    def saved_signals(self):
+        return self.received_count - self.emitted_count
+
+class StreamState:
+    """一个流在多次尝试（失败转移）之间共享的累积结果。"""
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.full_response = str()
+        self.reasoning_response = str()  # 推理模型的思考过程，不参与显示
+        self.usage = None
+
+# 大模型流式引擎
+class LLMStreamEngine(QObject):
+    """
+    常驻的 asyncio 事件循环，所有大模型流式请求都作为协程在其中运行。
+    事件循环独占一个后台线程，结果通过 Qt 信号排队回到 UI 线程；
+    每个请求以 stream_id 区分，可以并发多个，并随时取消。
+    """
+    token_received = pyqtSignal(int, str)          # stream_id, 合并后的 token 批次
+    stream_finished = pyqtSignal(int, str, int)    # stream_id, 完整回复, 本次请求 token 数
+    stream_error = pyqtSignal(int, str, str)       # stream_id, 已收到的部分回复, 错误信息
+    stream_cancelled = pyqtSignal(int, float)      # stream_id, 从请求取消到连接释放的毫秒数
+    stream_failover = pyqtSignal(int, str, str, bool)  # stream_id, 接手的供应商, 原因, 是否从中断处续写
+    stream_cache_usage = pyqtSignal(int, int, int) # stream_id, 提示词 token 数, 命中前缀缓存的 token 数
+
+    def __init__(self, flush_interval_ms=16, flush_max_chars=256, ttft_timeout=20.0,
+                 inter_token_timeout=15.0, max_failover=2, parent=None):
+        super().__init__(parent)
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_max_chars = flush_max_chars
+        self.ttft_timeout = ttft_timeout                # 首个 token 的截止时间（秒）
+        self.inter_token_timeout = inter_token_timeout  # 相邻 token 之间的最大间隔（秒）
+        self.max_failover = max_failover
+        self._stream_ids = itertools.count(1)
+        self._tasks = dict()  # 只在事件循环线程内读写
+        self._cancel_requested_at = dict()
+        self.cancel_latencies_ms = collections.deque(maxlen=50)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='llm-stream-engine', daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """在引擎的事件循环中运行任意协程，返回 concurrent.futures.Future。"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def start_stream(self, model_manager, messages, provider_name=None, fallback_providers=(), allow_race=False):
+        """allow_race 只给对首 token 延迟敏感的主回复使用，摘要、翻译等后台请求不赛跑，免得成本翻倍。"""
+        stream_id = next(self._stream_ids)
+        # 拷贝一份，UI 线程之后修改对话历史不影响正在发送的请求
+        messages = [dict(message) for message in messages]
+        providers = self._failover_order(provider_name or model_manager.provider_name, fallback_providers)
+        coro = self._run_stream(stream_id, model_manager, messages, providers, allow_race)
+        self._loop.call_soon_threadsafe(self._create_task, stream_id, coro)
+        return stream_id
+
+    def replay(self, response):
+        """把缓存的完整回复当作一个瞬间完成的流，经同样的信号交给 UI。"""
+        stream_id = next(self._stream_ids)
+        self._loop.call_soon_threadsafe(self._create_task, stream_id, self._replay(stream_id, response))
+        return stream_id
+
+    def cancel(self, stream_id):
+        self._cancel_requested_at[stream_id] = time.perf_counter()
+        self._loop.call_soon_threadsafe(self._cancel_task, stream_id)
+
+    @property
+    def last_cancel_latency_ms(self):
+        return self.cancel_latencies_ms[-1] if self.cancel_latencies_ms else None
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _create_task(self, stream_id, coro):
+        task = self._loop.create_task(coro)
+        self._tasks[stream_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(stream_id, None))
+
+    def _cancel_task(self, stream_id):
+        task = self._tasks.get(stream_id)
+        if task is not None:
+            task.cancel()
+        else:
+            self._cancel_requested_at.pop(stream_id, None)  # 已经结束的流
+
+    def _failover_order(self, primary, fallback_providers):
+        providers = [primary] + [provider for provider in fallback_providers if provider != primary]
+        if len(providers) == 1:
+            providers.append(primary)  # 没有备用供应商时在原供应商上重试
+        return providers[:self.max_failover + 1]
+
+    @staticmethod
+    def _can_resume(model_manager, provider_name):
+        """只有在 llm_api_key.yaml 中配置了 prefix_completion 的供应商支持 assistant 前缀续写。"""
+        return bool(model_manager.client_pool.llm_api_data[provider_name].get('prefix_completion'))
+
+    @staticmethod
+    def _resume_messages(messages, partial_response):
+        # 把已经流出的内容作为 assistant 前缀续写，用户看到的部分不会丢失；
+        # DeepSeek beta 续写接口需要显式声明 prefix
+        if not partial_response:
+            return messages
+        return messages + [{"role": "assistant", "content": partial_response, "prefix": True}]
+
+    async def _consume_attempt(self, state, model_manager, messages, provider_name, allow_race):
+        """读取一次请求的流，首 token 或 token 间隔超出截止时间时抛出 TimeoutError。"""
+        deadline = self._loop.time() + self.ttft_timeout
+        stream_response = None
+        try:
+            stream_response = await asyncio.wait_for(
+                model_manager.get_llm_response(messages, provider_name, allow_race), self.ttft_timeout)
+            chunk_iterator = stream_response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunk_iterator), max(deadline - self._loop.time(), 0))
+                except StopAsyncIteration:
+                    return
+                content, reasoning_content, chunk_usage = parse_stream_chunk(chunk)
+                if content or reasoning_content:
+                    deadline = self._loop.time() + self.inter_token_timeout
+                if content:
+                    state.batcher.push(content)
+                    state.full_response += content
+                if reasoning_content:
+                    state.reasoning_response += reasoning_content
+                if chunk_usage is not None:
+                    state.usage = chunk_usage
+        finally:
+            # 取消会立即打断正在等待的 socket 读取，这里关闭响应，让连接当场释放，
+            # 不必等供应商发来下一个 chunk
+            if stream_response is not None:
+                await stream_response.close()
+
+    async def _replay(self, stream_id, response):
+        self.token_received.emit(stream_id, response)
+        self.stream_finished.emit(stream_id, response, 0)
+
+    async def _run_stream(self, stream_id, model_manager, messages, providers, allow_race=False):
+        batcher = TokenBatcher(lambda text: self.token_received.emit(stream_id, text),
+                               self.flush_interval_ms, self.flush_max_chars, loop=self._loop)
+        state = StreamState(batcher)
+        try:
+            for attempt, provider_name in enumerate(providers):
+                request_messages = self._resume_messages(messages, state.full_response)
+                try:
+                    # 只有第一次尝试参与赛跑，失败转移时按既定顺序续写
+                    await self._consume_attempt(state, model_manager, request_messages, provider_name,
+                                                allow_race=allow_race and attempt == 0)
+                    break
+                except (asyncio.TimeoutError, openai.APIConnectionError) as e:
+                    if attempt + 1 == len(providers):
+                        raise
+                    reason = '响应停滞超时' if isinstance(e, asyncio.TimeoutError) else str(e)
+                    resumed = not state.full_response or self._can_resume(model_manager, providers[attempt + 1])
+                    if not resumed:
+                        # 不支持前缀续写的供应商会重新给出完整回复，已流出的部分作废，由 UI 清空后重新开始
+                        batcher.discard()
+                        state.full_response = str()
+                        state.reasoning_response = str()
+                    print(f'{provider_name} {reason}，转由 {providers[attempt + 1]} '
+                          f'{"续写" if resumed else "重新生成"}')
+                    self.stream_failover.emit(stream_id, providers[attempt + 1], reason, resumed)
+        except asyncio.CancelledError:
+            batcher.discard()
+            requested_at = self._cancel_requested_at.pop(stream_id, time.perf_counter())
+            latency_ms = (time.perf_counter() - requested_at) * 1000
+            self.cancel_latencies_ms.append(latency_ms)
+            self.stream_cancelled.emit(stream_id, latency_ms)
+            raise
+        except Exception as e:
+            batcher.flush()
+            error_message = '响应停滞超时' if isinstance(e, asyncio.TimeoutError) else str(e)
+            self.stream_error.emit(stream_id, state.full_response, error_message)
+            return
+        batcher.flush()
+        print(f'token 片段 {batcher.received_count} 个，'
+              f'合并为 {batcher.emitted_count} 次信号，节省 {batcher.saved_signals} 次')
+        total_tokens = state.usage.total_tokens if state.usage is not None else 0
+        prompt_tokens, cached_tokens = parse_cache_usage(state.usage)
+        if cached_tokens is not None:
+            self.stream_cache_usage.emit(stream_id, prompt_tokens, cached_tokens)
+        self.stream_finished.emit(stream_id, state.full_response, total_tokens)
@@ -1,72 +1,136 @@
-from typing import Annotated, Literal
-
-import httpx
-import ormsgpack
-from pydantic import BaseModel, conint
-
-
-# 在代码开头添加代理设置
-vpn_host = 'http://192.168.1.11:7892'
-api = ''
-
-class ServeReferenceAudio(BaseModel):
-    audio: bytes
-    text: str
-
-
-class ServeTTSRequest(BaseModel):
-    text: str
-    chunk_length: Annotated[int, conint(ge=100, le=300, strict=True)] = 200
-    # Audio format
-    format: Literal["wav", "pcm", "mp3"] = "mp3"
-    mp3_bitrate: Literal[64, 128, 192] = 128
-    # References audios for in-context learning
-    references: list[ServeReferenceAudio] = []
-    # Reference id
-    # For example, if you want use https://fish.audio/m/7f92f8afb8ec43bf81429cc1c9199cb1/
-    # Just pass 7f92f8afb8ec43bf81429cc1c9199cb1
-    reference_id: str | None = None
-    # Normalize text for en & zh, this increase stability for numbers
-    normalize: bool = True
-    # Balance mode will reduce latency to 300ms, but may decrease stability
-    latency: Literal["normal", "balanced"] = "normal"
-
-def get_voice(context, role_id, sample_sound_path, sample_text, save_path):
-    try:
-        request = ServeTTSRequest(
-            text=context, # 要合成语音的文本
-            reference_id= role_id,
-            references=[
-                ServeReferenceAudio(
-                    audio=open(sample_sound_path, "rb").read(),
-                    text=sample_text, # 样例音频以及文字
-                )
-            ],
-        )
-    except Exception as e:
-        print(f'创建请求失败:{e}')
-
-    try:
-        with (
-            httpx.Client(
-                proxy=vpn_host,
-                verify=False
-
-            ) as client,
-            open(save_path, "wb") as f,
-        ):
-            with client.stream(
-                "POST",
-                "https://api.fish.audio/v1/tts",
-                content=ormsgpack.packb(request, option=ormsgpack.OPT_SERIALIZE_PYDANTIC),
-                headers={
-                    "authorization": api,
-                    "content-type": "application/msgpack",
-                    "model": "speech-1.6",  # Specify which TTS model to use
-                },
-                timeout=None,
-            ) as response:
-                for chunk in response.iter_bytes():
-                    f.write(chunk)
-    except Exception as e:
-        print(f'语音合成请求失败:{e}')
\ No newline at end of file
+import os
+import struct
+import threading
+from typing import Annotated, Literal
+
+import httpx
+import ormsgpack
+from pydantic import BaseModel, conint
+
+from tts_backend import TTSBackend, AudioFileWriter, PCM_SAMPLE_RATE, TTS_CONNECT_TIMEOUT, TTS_READ_TIMEOUT
+
+
+# 在代码开头添加代理设置
+vpn_host = 'http://192.168.1.11:7892'
+api = ''
+FISH_BASE_URL = 'https://api.fish.audio'
+
+class ServeReferenceAudio(BaseModel):
+    audio: bytes
+    text: str
+
+
+class ServeTTSRequest(BaseModel):
+    text: str
+    chunk_length: Annotated[int, conint(ge=100, le=300, strict=True)] = 200
+    # Audio format
+    format: Literal["wav", "pcm", "mp3"] = "mp3"
+    sample_rate: int | None = None
+    mp3_bitrate: Literal[64, 128, 192] = 128
+    # References audios for in-context learning
+    references: list[ServeReferenceAudio] = []
+    # Reference id
+    # For example, if you want use https://fish.audio/m/7f92f8afb8ec43bf81429cc1c9199cb1/
+    # Just pass 7f92f8afb8ec43bf81429cc1c9199cb1
+    reference_id: str | None = None
+    # Normalize text for en & zh, this increase stability for numbers
+    normalize: bool = True
+    # Balance mode will reduce latency to 300ms, but may decrease stability
+    latency: Literal["normal", "balanced"] = "normal"
+
+class FishTTSSession:
+    """
+    长期存在的 Fish Audio 会话：复用同一个 httpx.Client 的连接池，免去每句话重新走代理握手；
+    参考音频按 (路径, 修改时间, 文本) 缓存为已序列化好的 msgpack 字节，之后每次请求直接拼接。
+    角色配置了 fish_role_key 时只发送 reference_id，不再上传参考音频。可在多个合成线程中共用。
+    """
+    def __init__(self, api_key=api, model_name='speech-1.6', proxy=vpn_host, base_url=FISH_BASE_URL):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.base_url = base_url
+        self.client = httpx.Client(proxy=proxy, verify=False,
+                                   timeout=httpx.Timeout(TTS_READ_TIMEOUT, connect=TTS_CONNECT_TIMEOUT),
+                                   limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120))
+        self._lock = threading.Lock()
+        self._reference_cache = dict()
+
+    def packed_references(self, sample_sound_path, sample_text):
+        key = (sample_sound_path, os.path.getmtime(sample_sound_path), sample_text)
+        with self._lock:
+            packed = self._reference_cache.get(key)
+        if packed is None:
+            with open(sample_sound_path, "rb") as f:
+                references = [ServeReferenceAudio(audio=f.read(), text=sample_text)]
+            packed = ormsgpack.packb(references, option=ormsgpack.OPT_SERIALIZE_PYDANTIC)
+            with self._lock:
+                # 样例音频被替换后 mtime 变化，旧条目随之作废
+                for stale_key in [k for k in self._reference_cache if k[0] == sample_sound_path]:
+                    del self._reference_cache[stale_key]
+                self._reference_cache[key] = packed
+        return packed
+
+    def build_payload(self, context, role_id, sample_sound_path, sample_text, audio_format='mp3'):
+        request = ServeTTSRequest(
+            text=context, # 要合成语音的文本
+            format=audio_format,
+            sample_rate=PCM_SAMPLE_RATE if audio_format == 'pcm' else None,
+            reference_id=role_id or None,
+        )
+        fields = request.model_dump(exclude={'references'})
+        # 与整体 packb 得到的 map 等价：逐个字段序列化后，把缓存好的 references 直接拼在末尾
+        parts = [ormsgpack.packb(name) + ormsgpack.packb(value) for name, value in fields.items()]
+        parts.append(ormsgpack.packb('references'))
+        if role_id:
+            parts.append(ormsgpack.packb([]))
+        else:
+            parts.append(self.packed_references(sample_sound_path, sample_text))
+        return _msgpack_map_header(len(parts) // 2) + b''.join(parts)
+
+    def synthesize(self, context, role_id, sample_sound_path, sample_text, save_path, audio_format='mp3',
+                   on_chunk=None):
+        payload = self.build_payload(context, role_id, sample_sound_path, sample_text, audio_format)
+        with (
+            self.client.stream(
+                "POST",
+                f"{self.base_url}/v1/tts",
+                content=payload,
+                headers={
+                    "authorization": self.api_key,
+                    "content-type": "application/msgpack",
+                    "model": self.model_name,  # Specify which TTS model to use
+                },
+            ) as response,
+            AudioFileWriter(save_path, audio_format) as f,
+        ):
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                chunk = f.write(chunk)
+                if on_chunk is not None and chunk:
+                    on_chunk(chunk)
+
+    def close(self):
+        self.client.close()
+
+
+class FishBackend(TTSBackend):
+    """Fish Audio 后端，使用 voice 中的 fish_role_key，没有时上传参考音频。"""
+    name = 'fish'
+
+    def __init__(self, model_name='speech-1.6', api_key='', base_url=None, proxy=vpn_host, **options):
+        super().__init__(model_name, api_key or api, base_url or FISH_BASE_URL, proxy, **options)
+        self.session = FishTTSSession(api_key=self.api_key, model_name=model_name, proxy=proxy or None,
+                                      base_url=self.base_url)
+
+    def synthesize(self, context, voice, save_path, audio_format='mp3', on_chunk=None):
+        self.session.synthesize(context, voice.get("fish_role_key"), voice["sample_sound_path"],
+                                voice["sample_text"], save_path, audio_format=audio_format, on_chunk=on_chunk)
+
+    def close(self):
+        self.session.close()
+
+
+def _msgpack_map_header(size):
+    if size < 16:
+        return bytes([0x80 | size])
+    return b'\xde' + struct.pack('>H', size)
+
@@ -0,0 +1,65 @@
+import json
+
+import httpx
+
+from tts_backend import TTSBackend, AudioFileWriter, PCM_SAMPLE_RATE, TTS_CONNECT_TIMEOUT, TTS_READ_TIMEOUT
+
+MINIMAX_BASE_URL = 'https://api.minimax.chat'
+
+
+class MiniMaxBackend(TTSBackend):
+    """
+    MiniMax T2A v2 后端，使用 voice 中的 minmax_role_key 作为 voice_id。
+    以流式 SSE 请求，每个事件的 data.audio 为十六进制编码的音频片段；
+    status 为 2 的最后一个事件会重复整段音频，直接跳过。
+    """
+    name = 'minimax'
+
+    def __init__(self, model_name='speech-02-turbo', api_key='', base_url=None, proxy=None, group_id='',
+                 **options):
+        super().__init__(model_name, api_key, base_url or MINIMAX_BASE_URL, proxy, **options)
+        self.group_id = group_id
+        self.client = httpx.Client(proxy=proxy or None,
+                                   timeout=httpx.Timeout(TTS_READ_TIMEOUT, connect=TTS_CONNECT_TIMEOUT),
+                                   limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120))
+
+    def build_request(self, context, voice_id, audio_format='mp3'):
+        return {
+            "model": self.model_name,
+            "text": context,
+            "stream": True,
+            "voice_setting": {"voice_id": voice_id, "speed": 1, "vol": 1, "pitch": 0},
+            "audio_setting": {"sample_rate": PCM_SAMPLE_RATE if audio_format == 'pcm' else 32000,
+                              "bitrate": 128000, "format": audio_format, "channel": 1},
+        }
+
+    def synthesize(self, context, voice, save_path, audio_format='mp3', on_chunk=None):
+        headers = {"authorization": f"Bearer {self.api_key}"} if self.api_key else None
+        with (
+            self.client.stream(
+                "POST",
+                f"{self.base_url}/v1/t2a_v2",
+                params={"GroupId": self.group_id} if self.group_id else None,
+                json=self.build_request(context, voice["minmax_role_key"], audio_format),
+                headers=headers,
+            ) as response,
+            AudioFileWriter(save_path, audio_format) as f,
+        ):
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith('data:'):
+                    continue
+                event = json.loads(line[len('data:'):])
+                base_resp = event.get("base_resp") or {}
+                if base_resp.get("status_code"):
+                    raise RuntimeError(f'MiniMax 合成失败: {base_resp.get("status_msg")}')
+                data = event.get("data") or {}
+                if data.get("status") == 2 or not data.get("audio"):
+                    continue
+                chunk = bytes.fromhex(data["audio"])
+                chunk = f.write(chunk)
+                if on_chunk is not None and chunk:
+                    on_chunk(chunk)
+
+    def close(self):
+        self.client.close()
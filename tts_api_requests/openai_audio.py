@@ -0,0 +1,42 @@
+import httpx
+
+from tts_backend import TTSBackend, AudioFileWriter, OPENAI_PCM_SAMPLE_RATE, TTS_CONNECT_TIMEOUT, TTS_READ_TIMEOUT
+
+LOCAL_BASE_URL = 'http://127.0.0.1:8765'
+
+
+class OpenAISpeechBackend(TTSBackend):
+    """
+    OpenAI 兼容的 /v1/audio/speech 后端，本地部署的 TTS 服务大多提供这一接口。
+    音色取 tts_api_key.yaml 条目中的 voice，默认连接本机，不走代理。
+    """
+    name = 'openai'
+    pcm_sample_rate = OPENAI_PCM_SAMPLE_RATE
+
+    def __init__(self, model_name='tts-1', api_key='', base_url=None, proxy=None, voice='alloy', **options):
+        super().__init__(model_name, api_key, base_url or LOCAL_BASE_URL, proxy, **options)
+        self.voice = voice
+        self.client = httpx.Client(proxy=proxy or None,
+                                   timeout=httpx.Timeout(TTS_READ_TIMEOUT, connect=TTS_CONNECT_TIMEOUT),
+                                   limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120))
+
+    def synthesize(self, context, voice, save_path, audio_format='mp3', on_chunk=None):
+        headers = {"authorization": f"Bearer {self.api_key}"} if self.api_key else None
+        with (
+            self.client.stream(
+                "POST",
+                f"{self.base_url}/v1/audio/speech",
+                json={"model": self.model_name, "input": context, "voice": self.voice,
+                      "response_format": audio_format},
+                headers=headers,
+            ) as response,
+            AudioFileWriter(save_path, audio_format, self.pcm_sample_rate) as f,
+        ):
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                chunk = f.write(chunk)
+                if on_chunk is not None and chunk:
+                    on_chunk(chunk)
+
+    def close(self):
+        self.client.close()
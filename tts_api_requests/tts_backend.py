@@ -0,0 +1,225 @@
+import importlib
+import os
+import threading
+import wave
+
+import numpy as np
+
+# 请求 pcm 时统一使用 16 bit 单声道 44.1 kHz，流式播放器按此参数输出
+PCM_SAMPLE_RATE = 44100
+PCM_SAMPLE_WIDTH = 2
+OPENAI_PCM_SAMPLE_RATE = 24000  # OpenAI /v1/audio/speech 规定 pcm 为 24 kHz 16 bit 单声道
+
+# 流式请求的超时（秒）：连接与相邻两块数据之间的最长等待。不设上限时，卡住的请求
+# （对冲合成中落败的一方）会一直占着线程和连接
+TTS_CONNECT_TIMEOUT = 10.0
+TTS_READ_TIMEOUT = 15.0
+
+
+# tts_api_key.yaml 中条目的 mode -> "模块:类"，用到时才导入，未用到的后端不要求安装其依赖
+BACKEND_REGISTRY = {
+    "0": "fish_audio:FishBackend",
+    "1": "minimax_audio:MiniMaxBackend",
+    "2": "openai_audio:OpenAISpeechBackend",
+}
+
+
+def register_backend(mode, target):
+    """注册插件后端，target 为 "模块:类" 字符串或 TTSBackend 子类。"""
+    BACKEND_REGISTRY[str(mode)] = target
+
+
+def get_backend_class(mode):
+    target = BACKEND_REGISTRY[str(mode)]
+    if isinstance(target, str):
+        module_name, class_name = target.split(':')
+        target = getattr(importlib.import_module(module_name), class_name)
+        BACKEND_REGISTRY[str(mode)] = target
+    return target
+
+
+def create_tts_backend(tts_model_parameter):
+    """按 tts_api_key.yaml 的一个条目创建后端，base_url、proxy 等可选字段原样传入，便于指向本地桩服务。"""
+    options = {k: v for k, v in tts_model_parameter.items() if k not in ('mode', 'img_path')}
+    return get_backend_class(tts_model_parameter['mode'])(**options)
+
+
+class PCMResampler:
+    """16 bit 单声道 PCM 的流式线性重采样，跨块保留相位与上一块的最后一个采样，块与块之间没有接缝。"""
+    def __init__(self, source_rate, target_rate):
+        self.step = source_rate / target_rate
+        self._position = 0.0  # 下一个输出采样在输入中的位置，相对 _previous（没有时相对本块第一个采样）
+        self._previous = None
+        self._remainder = b''
+
+    def process(self, data):
+        data = self._remainder + data
+        usable = len(data) // PCM_SAMPLE_WIDTH * PCM_SAMPLE_WIDTH
+        self._remainder = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype='<i2').astype(np.float32)
+        if self._previous is not None:
+            samples = np.concatenate(([self._previous], samples))
+        if samples.size == 0:
+            return b''
+        last = samples.size - 1
+        count = int((last - self._position) // self.step) + 1 if last >= self._position else 0
+        positions = self._position + np.arange(count) * self.step
+        resampled = np.interp(positions, np.arange(samples.size), samples)
+        self._position += count * self.step - last
+        self._previous = samples[-1]
+        return np.round(resampled).astype('<i2').tobytes()
+
+
+class AudioFileWriter:
+    """
+    边收边写音频文件：mp3 等编码格式原样写入，裸 PCM 包上 wav 文件头，之后重放、口型同步都能直接读取。
+    后端输出的 PCM 采样率（sample_rate）与 PCM_SAMPLE_RATE 不同时先重采样，
+    之后的文件、缓存、流式播放都只需处理 PCM_SAMPLE_RATE 一种采样率。
+    write 返回实际写入的数据，后端把它交给 on_chunk。
+    """
+    def __init__(self, save_path, audio_format='mp3', sample_rate=PCM_SAMPLE_RATE):
+        self.save_path = save_path
+        self.audio_format = audio_format
+        self._file = None
+        self._resampler = PCMResampler(sample_rate, PCM_SAMPLE_RATE) \
+            if audio_format == 'pcm' and sample_rate != PCM_SAMPLE_RATE else None
+
+    def __enter__(self):
+        if self.audio_format == 'pcm':
+            self._file = wave.open(self.save_path, 'wb')
+            self._file.setnchannels(1)
+            self._file.setsampwidth(PCM_SAMPLE_WIDTH)
+            self._file.setframerate(PCM_SAMPLE_RATE)
+        else:
+            self._file = open(self.save_path, 'wb')
+        return self
+
+    def write(self, chunk):
+        if self._resampler is not None:
+            chunk = self._resampler.process(chunk)
+        if self.audio_format == 'pcm':
+            self._file.writeframesraw(chunk)
+        else:
+            self._file.write(chunk)
+        return chunk
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+
+
+class TTSBackend:
+    """
+    语音合成后端接口。voice 为人物卡 tts_setting.json 整理出的音色信息
+    （fish_role_key、minmax_role_key、sample_sound_path、sample_text），各后端取自己需要的字段。
+    """
+    name = 'base'
+    pcm_sample_rate = PCM_SAMPLE_RATE  # 请求 pcm 时服务端返回的采样率，AudioFileWriter 据此重采样
+
+    def __init__(self, model_name='', api_key='', base_url=None, proxy=None, **options):
+        self.model_name = model_name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.proxy = proxy
+        self.options = options
+
+    @property
+    def cache_id(self):
+        """合成结果缓存键的一部分：换后端或换模型后不会命中旧的音频。"""
+        return f'{self.name}/{self.model_name}'
+
+    def synthesize(self, context, voice, save_path, audio_format='mp3', on_chunk=None):
+        """合成 context 并边收边写入 save_path，每收到一块音频调用一次 on_chunk；失败时抛出异常。"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HedgeLost(Exception):
+    """对冲请求中落后的一方在收到首块数据时被中止。"""
+
+
+class HedgedBackend(TTSBackend):
+    """
+    对冲合成：先只请求 primary，deadline 秒内还没收到首块音频（或已失败）时再请求 secondary，
+    谁先返回首块音频就用谁，另一方在收到首块数据时中止并删除临时文件；
+    一直没有数据的一方由各后端 httpx 客户端的读超时（TTS_READ_TIMEOUT）结束。
+    """
+    name = 'hedged'
+
+    def __init__(self, primary, secondary, deadline=0.8):
+        super().__init__(model_name=f'{primary.cache_id}+{secondary.cache_id}')
+        self.primary = primary
+        self.secondary = secondary
+        self.deadline = deadline
+        self.last_winner = None
+
+    def synthesize(self, context, voice, save_path, audio_format='mp3', on_chunk=None):
+        condition = threading.Condition()
+        race = {"winner": None, "running": 0}
+        errors = dict()
+        paths = {self.primary: f'{save_path}.primary', self.secondary: f'{save_path}.secondary'}
+        threads = dict()
+
+        def forward(backend, chunk):
+            with condition:
+                if race["winner"] is None:
+                    race["winner"] = backend
+                    condition.notify_all()
+                won = race["winner"] is backend
+            if not won:
+                raise HedgeLost()
+            if on_chunk is not None:
+                on_chunk(chunk)
+
+        def run(backend):
+            try:
+                backend.synthesize(context, voice, paths[backend], audio_format,
+                                   lambda chunk: forward(backend, chunk))
+            except HedgeLost:
+                pass
+            except Exception as e:
+                errors[backend] = e
+            finally:
+                with condition:
+                    race["running"] -= 1
+                    condition.notify_all()
+                    lost = race["winner"] is not backend
+                if lost:
+                    _remove(paths[backend])
+
+        def start(backend):
+            with condition:
+                race["running"] += 1
+            threads[backend] = threading.Thread(target=run, args=(backend,), daemon=True,
+                                                name=f'tts-hedge-{backend.name}')
+            threads[backend].start()
+
+        start(self.primary)
+        with condition:
+            condition.wait_for(lambda: race["winner"] is not None or race["running"] == 0, timeout=self.deadline)
+            hedge = race["winner"] is None
+        if hedge:
+            print(f'{self.primary.name} 在 {self.deadline:.2f} s 内没有返回音频，同时请求 {self.secondary.name}')
+            start(self.secondary)
+            with condition:
+                condition.wait_for(lambda: race["winner"] is not None or race["running"] == 0)
+        winner = race["winner"]
+        if winner is None:
+            raise errors.get(self.primary) or errors.get(self.secondary) or RuntimeError('对冲合成没有返回音频')
+        threads[winner].join()
+        if winner in errors:
+            raise errors[winner]
+        os.replace(paths[winner], save_path)
+        self.last_winner = winner.name
+
+    def close(self):
+        self.primary.close()
+        self.secondary.close()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,129 @@
+import argparse
+import functools
+import io
+import json
+import struct
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from tts_backend import PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH, OPENAI_PCM_SAMPLE_RATE
+
+CHUNK_SECONDS = 0.1  # 每次发送 100 ms 的音频
+SECONDS_PER_CHAR = 0.2  # 按字数估算朗读时长
+
+
+@functools.lru_cache(maxsize=64)
+def sine_pcm(seconds, frequency=220.0, sample_rate=PCM_SAMPLE_RATE):
+    frames = np.arange(int(seconds * sample_rate))
+    return (8000 * np.sin(2 * np.pi * frequency * frames / sample_rate)).astype('<i2').tobytes()
+
+
+def wav_header(pcm_size, sample_rate=PCM_SAMPLE_RATE):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(PCM_SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b'')
+    header = bytearray(buffer.getvalue())
+    struct.pack_into('<I', header, 4, 36 + pcm_size)
+    struct.pack_into('<I', header, 40, pcm_size)
+    return bytes(header)
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    """
+    本地 TTS 桩服务，模拟 Fish Audio（/v1/tts）、OpenAI（/v1/audio/speech）与 MiniMax（/v1/t2a_v2）的流式接口。
+    按文本长度生成正弦波，首块延迟 ttfb 秒，之后按 pace 倍速分块发送（pace 为 0 时不等待）。
+    请求 pcm 时返回裸 PCM，其余格式一律返回 wav，用于测量延迟而非编码质量。
+    """
+    protocol_version = 'HTTP/1.1'
+    ttfb = 0.2
+    pace = 0.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/v1/tts'):
+            import ormsgpack
+            request = ormsgpack.unpackb(body)
+            self.stream_audio(request.get('text', ''), request.get('format', 'mp3'))
+        elif self.path.startswith('/v1/audio/speech'):
+            request = json.loads(body)
+            # 与 OpenAI 规范一致，pcm 为 24 kHz
+            self.stream_audio(request.get('input', ''), request.get('response_format', 'mp3'),
+                              sample_rate=OPENAI_PCM_SAMPLE_RATE)
+        elif self.path.startswith('/v1/t2a_v2'):
+            request = json.loads(body)
+            self.stream_minimax(request.get('text', ''), request.get('audio_setting', {}).get('format', 'mp3'))
+        else:
+            self.send_error(404)
+
+    def audio_chunks(self, text, sample_rate=PCM_SAMPLE_RATE):
+        # 先等待首包延迟再生成波形，测得的首包延迟只反映设定值，不含桩服务自身的计算
+        time.sleep(self.ttfb)
+        pcm = sine_pcm(max(len(text), 1) * SECONDS_PER_CHAR, sample_rate=sample_rate)
+        chunk_size = int(CHUNK_SECONDS * sample_rate) * PCM_SAMPLE_WIDTH
+        for start in range(0, len(pcm), chunk_size):
+            if start and self.pace:
+                time.sleep(CHUNK_SECONDS / self.pace)
+            yield pcm[start:start + chunk_size], len(pcm)
+
+    def write_chunk(self, data):
+        self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def begin(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def stream_audio(self, text, audio_format, sample_rate=PCM_SAMPLE_RATE):
+        self.begin('audio/pcm' if audio_format == 'pcm' else 'audio/wav')
+        for i, (chunk, total) in enumerate(self.audio_chunks(text, sample_rate)):
+            if i == 0 and audio_format != 'pcm':
+                chunk = wav_header(total, sample_rate) + chunk
+            self.write_chunk(chunk)
+        self.write_chunk(b'')
+
+    def stream_minimax(self, text, audio_format):
+        self.begin('text/event-stream')
+        audio = bytearray()
+        for i, (chunk, total) in enumerate(self.audio_chunks(text)):
+            if i == 0 and audio_format != 'pcm':
+                chunk = wav_header(total) + chunk
+            audio += chunk
+            self.write_chunk(f'data: {json.dumps({"data": {"audio": chunk.hex(), "status": 1}})}\n\n'.encode())
+        final = {"data": {"audio": audio.hex(), "status": 2}, "base_resp": {"status_code": 0}}
+        self.write_chunk(f'data: {json.dumps(final)}\n\n'.encode())
+        self.write_chunk(b'')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, ttfb=0.2, pace=0.0):
+    """在后台线程启动桩服务，返回 (server, base_url)；port 为 0 时自动选择空闲端口。"""
+    handler = type('StubTTSHandler', (StubTTSHandler,), {"ttfb": ttfb, "pace": pace})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='tts-stub-server').start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='本地 TTS 桩服务')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ttfb-ms', type=float, default=200)
+    parser.add_argument('--pace', type=float, default=0.0, help='相对实时的发送倍速，0 表示不限速')
+    args = parser.parse_args()
+    server, base_url = start_stub_server(args.port, args.ttfb_ms / 1000, args.pace)
+    print(f'TTS 桩服务已启动: {base_url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
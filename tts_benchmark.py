@@ -0,0 +1,122 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import wave
+
+from load_yaml import load_yaml_file
+from tts_backend import create_tts_backend
+
+# 固定的测试语料：长短不一的角色回复，覆盖短句、带标点的长句和中英混排
+BENCHMARK_CORPUS = [
+    "嗯，我在呢。",
+    "今天的天气真不错，要不要一起出去走走？",
+    "你又熬夜了吧？眼睛都红了，快去休息，明天再继续也不迟。",
+    "这首歌我听过！副歌那段旋律一直在脑子里转，怎么也停不下来。",
+    "OK，那我们先把计划列出来：第一步整理资料，第二步写大纲，第三步再慢慢打磨细节。",
+    "欸？你说的那个地方我也去过，街角有一家很小的咖啡店，老板会记住每个客人的口味。",
+    "别担心，失败一次又不代表什么。我们一起想想哪里出了问题，下次一定可以做得更好的。",
+    "晚安啦，做个好梦。",
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_backend(backend, corpus, voice, rounds=1):
+    """逐句合成语料，返回每句的 (字数, 首包耗时, 总耗时, 音频时长)；失败的句子跳过并打印原因。"""
+    results = list()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_path = os.path.join(tmp_dir, 'bench.wav')
+        for _ in range(rounds):
+            for text in corpus:
+                first_chunk = dict()
+                start = time.perf_counter()
+
+                def on_chunk(chunk):
+                    first_chunk.setdefault('time', time.perf_counter())
+
+                try:
+                    backend.synthesize(text, voice, save_path, audio_format='pcm', on_chunk=on_chunk)
+                except Exception as e:
+                    print(f'  {backend.name} 合成失败: {e}')
+                    continue
+                total = time.perf_counter() - start
+                with wave.open(save_path, 'rb') as wav_file:
+                    duration = wav_file.getnframes() / wav_file.getframerate()
+                results.append((len(text), first_chunk.get('time', start + total) - start, total, duration))
+    return results
+
+
+def report(name, results):
+    if not results:
+        print(f'{name}: 没有成功的合成')
+        return
+    ttfb = [r[1] * 1000 for r in results]
+    rtf = [r[2] / r[3] for r in results if r[3]]
+    elapsed = sum(r[2] for r in results)
+    print(f'{name} ({len(results)} 句)')
+    print(f'  首包延迟 ms  mean {statistics.mean(ttfb):.0f}  p50 {percentile(ttfb, 0.5):.0f}  '
+          f'p95 {percentile(ttfb, 0.95):.0f}')
+    if rtf:
+        print(f'  实时率 RTF   mean {statistics.mean(rtf):.3f}  p95 {percentile(rtf, 0.95):.3f}')
+    print(f'  吞吐量       {sum(r[0] for r in results) / elapsed:.1f} 字/s  '
+          f'{sum(r[3] for r in results) / elapsed:.2f} 音频秒/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TTS 后端延迟基准测试：首包延迟、实时率与吞吐量')
+    parser.add_argument('--backends', nargs='+', help='tts_api_key.yaml 中的条目名，默认测试全部')
+    parser.add_argument('--config', default='api_key/tts_api_key.yaml')
+    parser.add_argument('--corpus', help='自定义语料文件，每行一句')
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--stub', action='store_true', help='启动本地桩服务并让所有后端连接它')
+    parser.add_argument('--stub-ttfb-ms', type=float, default=200)
+    parser.add_argument('--stub-pace', type=float, default=0.0)
+    parser.add_argument('--role-card', help='人物卡目录，用于读取参考音频与音色 id')
+    args = parser.parse_args()
+
+    tts_model_ls = load_yaml_file(args.config) or dict()
+    names = args.backends or list(tts_model_ls)
+    corpus = BENCHMARK_CORPUS
+    if args.corpus:
+        with open(args.corpus, 'r', encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+
+    voice = {"fish_role_key": "benchmark", "minmax_role_key": "benchmark",
+             "sample_sound_path": None, "sample_text": ""}
+    if args.role_card:
+        from read_file import read_json
+        tts_setting = read_json(f'{args.role_card}/tts_setting/tts_setting.json')
+        voice = {"fish_role_key": tts_setting.get("fish_role_key"),
+                 "minmax_role_key": tts_setting.get("minmax_role_key"),
+                 "sample_sound_path": f'{args.role_card}/tts_setting/example.mp3',
+                 "sample_text": tts_setting.get("txt", "")}
+
+    overrides = dict()
+    if args.stub:
+        from tts_stub_server import start_stub_server
+        server, base_url = start_stub_server(ttfb=args.stub_ttfb_ms / 1000, pace=args.stub_pace)
+        overrides = {"base_url": base_url, "proxy": None}
+        print(f'使用本地桩服务 {base_url}')
+
+    for name in names:
+        if name not in tts_model_ls:
+            print(f'{name}: 配置中没有这个条目')
+            continue
+        try:
+            backend = create_tts_backend({**tts_model_ls[name], **overrides})
+        except Exception as e:
+            print(f'{name}: 创建后端失败: {e}')
+            continue
+        try:
+            report(name, run_backend(backend, corpus, voice, args.rounds))
+        finally:
+            backend.close()
+
+
+if __name__ == "__main__":
+    main()
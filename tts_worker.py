@@ -1,29 +1,343 @@
-from fish_audio import get_voice
-import uuid
-import threading
-import os
-import shutil
-
-def synthesis_sound(mode, save_path, context, role_id, sample_sound_path, sample_text):
-    tmp_save_path = f"{save_path}/tmp_audio/tmp.mp3"
-    save_path = f"{save_path}/tmp_audio/{uuid.uuid1()}.mp3"
-    if mode == 0:
-        get_voice(context, role_id, sample_sound_path, sample_text, tmp_save_path)
-    if os.path.exists(tmp_save_path):
-        if not os.path.exists(save_path):
-            shutil.copy(tmp_save_path, save_path)
-
-
-
-def synthesis_sound_async(mode, save_path, context, role_id, sample_sound_path, sample_text):
-    threading.Thread(target=synthesis_sound, daemon=True,
-                     args=(mode, save_path, context, role_id, sample_sound_path, sample_text)).start()
-
-if __name__ == "__main__":
-    synthesis_sound(0, 'Hello, word!',
-              "c578d8d6f60f4471aec26ee233d2a7ad",
-              "brian.mp3",
-              """So, what was Brittany Babbitt like? Oh, you know, at Applebee's she's all like, "Hi, may I take your order? " And at her bedroom window she's all like, "Ah, get out of here". how'd you find my apartment? Tale of two Brittanys, huh? Yeah, I mean, if you don't want me showing up at your house, don't put a smiley face on my receipt. Uh, your honor, the defense rests. See, you get it.
-                                    Have you read my book yet? I'm downloading it right now. It's beautiful. Yeah, this is, this is fine.
-                                    This isn't, this isn't weird. I'm a robot you.""",
+from tts_backend import create_tts_backend
+from response_clear import clean_llm_response
+from disk_cache import DiskLRUCache
+from audio_index import AudioIndex
+from lip_sync_envelope import write_envelope
+from PyQt5.QtCore import QObject, pyqtSignal
+import uuid
+import threading
+import os
+import shutil
+import wave
+import queue
+import itertools
+import collections
+import time
+
+WAV_HEADER_BYTES = 44
+PCM_REPLAY_FRAMES = 4096
+
+# 数值越小越先执行：当前回复先于备选回复的预合成
+TTS_PRIORITY_REPLY = 0
+TTS_PRIORITY_PREFETCH = 1
+
+tts_cache_max_bytes = 64 * 1024 * 1024
+_tts_caches = dict()
+_tts_caches_lock = threading.Lock()
+
+
+audio_retention_max_bytes = 256 * 1024 * 1024
+audio_retention_max_age = 7 * 24 * 3600
+_audio_indexes = dict()
+
+
+def configure_tts_cache(max_bytes):
+    global tts_cache_max_bytes
+    tts_cache_max_bytes = max_bytes
+
+
+def configure_audio_retention(max_bytes, max_age):
+    global audio_retention_max_bytes, audio_retention_max_age
+    audio_retention_max_bytes = max_bytes
+    audio_retention_max_age = max_age
+
+
+def get_audio_index(save_path):
+    """每张人物卡的 tmp_audio 索引，生成的音频登记在这里并按保留策略淘汰。"""
+    with _tts_caches_lock:
+        index = _audio_indexes.get(save_path)
+        if index is None:
+            index = AudioIndex(f"{save_path}/tmp_audio", max_bytes=audio_retention_max_bytes,
+                               max_age=audio_retention_max_age)
+            _audio_indexes[save_path] = index
+        return index
+
+
+def get_tts_cache(save_path):
+    """每张人物卡一个合成结果缓存，各自按大小上限淘汰。"""
+    with _tts_caches_lock:
+        cache = _tts_caches.get(save_path)
+        if cache is None:
+            cache = DiskLRUCache(f"{save_path}/tts_cache", max_bytes=tts_cache_max_bytes)
+            _tts_caches[save_path] = cache
+        return cache
+
+
+def has_audio(path, audio_format='mp3'):
+    # 请求失败时 pcm 格式只留下一个空的 wav 文件头
+    min_size = WAV_HEADER_BYTES if audio_format == 'pcm' else 0
+    return os.path.exists(path) and os.path.getsize(path) > min_size
+
+
+def synthesis_with_cache(backend, save_path, context, voice, audio_path, audio_format='mp3', on_chunk=None):
+    """
+    用 backend 合成 context 写入 audio_path。相同的 (文本, 音色, 后端与模型, 格式) 直接从人物卡的缓存复制，
+    不发网络请求；on_chunk 不为空时把缓存中的 PCM 数据按块回放，与网络合成走同一条播放路径。
+    """
+    cache = get_tts_cache(save_path)
+    key = cache.make_key(context, voice, backend.cache_id, audio_format)
+    cached_path = cache.get_path(key)
+    if cached_path is not None:
+        try:
+            shutil.copyfile(cached_path, audio_path)
+            print(f'语音缓存命中，命中率 {cache.hit_rate:.0%}')
+            if on_chunk is not None:
+                with wave.open(audio_path, 'rb') as wav_file:
+                    while chunk := wav_file.readframes(PCM_REPLAY_FRAMES):
+                        on_chunk(chunk)
+            return
+        except FileNotFoundError:
+            pass  # 刚好被淘汰，重新合成
+    try:
+        backend.synthesize(context, voice, audio_path, audio_format=audio_format, on_chunk=on_chunk)
+    except Exception as e:
+        # 中途失败时已收到的部分仍可播放，但不能进缓存，否则之后同样的文本一直命中这段残缺的音频
+        print(f'语音合成请求失败({backend.name}):{e}')
+    else:
+        if has_audio(audio_path, audio_format):
+            cache.put_file(key, audio_path)
+
+
+def finish_clip(save_path, audio_path, context, envelope=True):
+    """
+    音频改名到位后调用：在合成线程里顺带算好口型包络，再登记到 tmp_audio 的索引。
+    流式播放时口型直接跟随音频输出的 RMS，不会读取包络，传 envelope=False 跳过。
+    """
+    if envelope:
+        write_envelope(audio_path)
+    get_audio_index(save_path).add(audio_path, context)
+
+
+def synthesis_sound(backend, save_path, context, voice, on_ready=None):
+    """
+    合成整段语音。先写入独立的 .part 文件，完成后原子改名为 .mp3，
+    再通过 on_ready 把路径直接交给播放端，播放端不必轮询目录，也不会读到写了一半的文件。
+    """
+    name = uuid.uuid1()
+    part_path = f"{save_path}/tmp_audio/{name}.part"
+    audio_path = f"{save_path}/tmp_audio/{name}.mp3"
+    synthesis_with_cache(backend, save_path, context, voice, part_path)
+    if not has_audio(part_path):
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        return
+    os.replace(part_path, audio_path)
+    finish_clip(save_path, audio_path, context)
+    if on_ready is not None:
+        on_ready(audio_path)
+
+
+def synthesis_sound_async(backend, save_path, context, voice, on_ready=None):
+    get_tts_scheduler().submit(synthesis_sound, backend, save_path, context, voice, on_ready, group='reply')
+
+
+def prefetch_sound(backend, save_path, context, voice, audio_format='mp3'):
+    """只把合成结果写入人物卡的缓存，之后真正播放这段文本时直接命中。"""
+    part_path = f"{get_tts_cache(save_path).cache_dir}/{uuid.uuid1()}.part"
+    try:
+        synthesis_with_cache(backend, save_path, context, voice, part_path, audio_format=audio_format)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+def prefetch_sound_async(backend, save_path, context, voice, audio_format='mp3'):
+    get_tts_scheduler().submit(prefetch_sound, backend, save_path, context, voice, audio_format,
+                               priority=TTS_PRIORITY_PREFETCH, group='prefetch')
+
+
+class TTSScheduler:
+    """
+    固定数量的合成线程共用一个优先级队列，同优先级按提交顺序执行。
+    任务按 group 分组，cancel(group) 之后该组还在排队的任务直接丢弃，不再发出请求。
+    记录队列深度、排队等待与合成耗时（指数滑动平均）。
+    """
+    def __init__(self, max_workers=2, alpha=0.3):
+        self.alpha = alpha
+        self.mean_wait = 0.0
+        self.mean_latency = 0.0
+        self.completed = 0
+        self.cancelled = 0
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._generations = collections.Counter()
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, daemon=True, name=f'tts-{i}')
+                         for i in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def submit(self, func, *args, priority=TTS_PRIORITY_REPLY, group=None):
+        with self._lock:
+            generation = self._generations[group]
+        self._queue.put((priority, next(self._sequence), (func, args, group, generation, time.perf_counter())))
+
+    def cancel(self, group):
+        with self._lock:
+            self._generations[group] += 1
+
+    def stats(self):
+        return {"queue_depth": self.queue_depth, "completed": self.completed, "cancelled": self.cancelled,
+                "mean_wait": self.mean_wait, "mean_latency": self.mean_latency}
+
+    def shutdown(self):
+        for _ in self._workers:
+            self._queue.put((-1, next(self._sequence), None))  # 插到队首，线程取到后退出
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            func, args, group, generation, submitted_at = job
+            with self._lock:
+                stale = generation != self._generations[group]
+                if stale:
+                    self.cancelled += 1
+            if stale:
+                continue
+            started_at = time.perf_counter()
+            try:
+                func(*args)
+            except Exception as e:
+                print(f'语音合成任务失败: {e}')
+            finished_at = time.perf_counter()
+            with self._lock:
+                wait, latency = started_at - submitted_at, finished_at - started_at
+                if self.completed:
+                    self.mean_wait += self.alpha * (wait - self.mean_wait)
+                    self.mean_latency += self.alpha * (latency - self.mean_latency)
+                else:
+                    self.mean_wait, self.mean_latency = wait, latency
+                self.completed += 1
+
+
+_scheduler = None
+
+
+def get_tts_scheduler(max_workers=2):
+    """进程内共用的合成调度器，第一次调用时按 max_workers 创建。"""
+    global _scheduler
+    with _tts_caches_lock:
+        if _scheduler is None:
+            _scheduler = TTSScheduler(max_workers=max_workers)
+        return _scheduler
+
+
+class SentenceSpeechPipeline(QObject):
+    """
+    逐句语音合成：回复每完成一句就提交合成，多句并行请求，合成结果按句子顺序通过 audio_ready 发出。
+    每句先写入独立的临时文件，合成完成后再改名，播放端不会读到写了一半的音频。
+
+    传入 player（AudioEngine）时改为请求 PCM，收到的音频块直接送进播放器边收边播：
+    正在播放的句子的数据立即送入，后面句子先收到的数据暂存，轮到它时再一次送入。
+    """
+    sentence_synthesized = pyqtSignal(int, int, str)  # 代数, 句子序号, 音频路径（合成失败为空）
+    audio_ready = pyqtSignal(str)                     # 按句子顺序发出的音频路径
+
+    def __init__(self, scheduler, player=None):
+        super().__init__()
+        self.scheduler = scheduler
+        self.player = player
+        self._stream_lock = threading.Lock()
+        self._stream_index = 0        # 正在送入播放器的句子
+        self._stream_chunks = dict()  # 还没轮到的句子已收到的音频块
+        self._stream_done = set()     # 已收完但还没轮到的句子
+        self._generation = 0
+        self._next_index = 0      # 下一句提交的序号
+        self._play_index = 0      # 下一句应当发出的序号
+        self._finished = dict()   # 已合成、等待前面句子的 序号 -> 路径
+        # 合成线程发出的信号排队回到主线程，在主线程里按序号重新排序
+        self.sentence_synthesized.connect(self._on_sentence_synthesized)
+
+    def reset(self):
+        """开始新的回复，丢弃上一条回复尚未发出的句子，还在排队的合成任务不再执行。"""
+        self.scheduler.cancel('reply')
+        self._generation += 1
+        self._next_index = 0
+        self._play_index = 0
+        self._finished.clear()
+        if self.player is not None:
+            with self._stream_lock:
+                self._stream_index = 0
+                self._stream_chunks.clear()
+                self._stream_done.clear()
+            self.player.clear()
+
+    def speak(self, backend, save_path, sentence, voice):
+        context = clean_llm_response(sentence)
+        if not context:
+            return  # 整句都是动作描写
+        self.scheduler.submit(self._synthesis, self._generation, self._next_index, backend, save_path, context,
+                              voice, group='reply')
+        self._next_index += 1
+
+    @property
+    def audio_format(self):
+        return 'pcm' if self.player is not None else 'mp3'
+
+    def _synthesis(self, generation, index, backend, save_path, context, voice):
+        name = uuid.uuid1()
+        audio_format = self.audio_format
+        part_path = f"{save_path}/tmp_audio/{name}.part"
+        audio_path = f"{save_path}/tmp_audio/{name}.{'wav' if audio_format == 'pcm' else 'mp3'}"
+        on_chunk = (lambda chunk: self._stream_chunk(generation, index, chunk)) if self.player is not None else None
+        ready_path = ''
+        try:
+            synthesis_with_cache(backend, save_path, context, voice, part_path,
+                                 audio_format=audio_format, on_chunk=on_chunk)
+            if has_audio(part_path, audio_format):
+                os.replace(part_path, audio_path)
+                ready_path = audio_path
+                finish_clip(save_path, audio_path, context, envelope=self.player is None)
+        finally:
+            if self.player is not None:
+                self._stream_finished(generation, index)
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            # 无论成败都要发出，否则后面的句子一直等这一句
+            self.sentence_synthesized.emit(generation, index, ready_path)
+
+    def _on_sentence_synthesized(self, generation, index, audio_path):
+        if generation != self._generation:
+            return
+        self._finished[index] = audio_path
+        while self._play_index in self._finished:
+            audio_path = self._finished.pop(self._play_index)
+            self._play_index += 1
+            if audio_path:  # 合成失败的句子跳过，不阻塞后面的句子
+                self.audio_ready.emit(audio_path)
+
+    def _stream_chunk(self, generation, index, chunk):
+        with self._stream_lock:
+            if generation != self._generation:
+                return
+            if index == self._stream_index:
+                self.player.feed(chunk)
+            else:
+                self._stream_chunks.setdefault(index, list()).append(chunk)
+
+    def _stream_finished(self, generation, index):
+        with self._stream_lock:
+            if generation != self._generation:
+                return
+            self._stream_done.add(index)
+            # 当前句收完后轮到下一句：先送入它已暂存的数据，若它也已收完则继续往后
+            while self._stream_index in self._stream_done:
+                self._stream_done.discard(self._stream_index)
+                self._stream_index += 1
+                for chunk in self._stream_chunks.pop(self._stream_index, ()):
+                    self.player.feed(chunk)
+
+if __name__ == "__main__":
+    synthesis_sound(create_tts_backend({"mode": "0"}), '.', 'Hello, word!', {
+              "fish_role_key": "c578d8d6f60f4471aec26ee233d2a7ad",
+              "sample_sound_path": "brian.mp3",
+              "sample_text": """So, what was Brittany Babbitt like? Oh, you know, at Applebee's she's all like, "Hi, may I take your order? " And at her bedroom window she's all like, "Ah, get out of here". how'd you find my apartment? Tale of two Brittanys, huh? Yeah, I mean, if you don't want me showing up at your house, don't put a smiley face on my receipt. Uh, your honor, the defense rests. See, you get it.
+                                    Have you read my book yet? I'm downloading it right now. It's beautiful. Yeah, this is, this is fine.
+                                    This isn't, this isn't weird. I'm a robot you."""},
               )
\ No newline at end of file